@@ -1,14 +1,22 @@
 import streamlit as st
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tempfile
+from io import BytesIO
 from datetime import datetime
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 import base64
+import hashlib
+import shutil
 import difflib
-import plotly.graph_objects as go
 import numpy as np
+from PIL import Image
+from rapidfuzz import process, fuzz
 
 st.set_page_config(
     page_title="Agent Insights Dashboard", 
@@ -18,12 +26,52 @@ st.set_page_config(
 
 # Global variables for images
 HEADSHOTS_DIR = "headshots_cache"  # For player headshots
-PLACEHOLDER_IMAGE_URL = "https://upload.wikimedia.org/wikipedia/en/3/3a/05_NHL_Shield.svg"
+PLACEHOLDER_IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "placeholder.svg")
 
 # Globals for agent photos (unused in leaderboard now)
 AGENT_PHOTOS_DIR = "agent_photos"  # Folder for agent photos from release
 AGENT_PLACEHOLDER_IMAGE_URL = "https://upload.wikimedia.org/wikipedia/commons/8/89/Agent_placeholder.png"
 
+# Globals for the workbook download (cached outside the app folder)
+DATA_URL = "https://raw.githubusercontent.com/ethanhetu/agent-dashboard/main/AP%20Final.xlsx"
+DATA_CACHE_DIR = os.path.join(tempfile.gettempdir(), "agent_dashboard")
+DATA_ETAG_PATH = os.path.join(DATA_CACHE_DIR, "AP Final.xlsx.etag")
+SHEET_FORMAT_VERSION = "3"  # Bump when the Parquet output changes
+
+HTTP_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Tracked seasons and their PIBA cost / PC columns
+SEASONS = [
+    ('2018-19', 'COST 18-19', 'PC 18-19'),
+    ('2019-20', 'COST 19-20', 'PC 19-20'),
+    ('2020-21', 'COST 20-21', 'PC 20-21'),
+    ('2021-22', 'COST 21-22', 'PC 21-22'),
+    ('2022-23', 'COST 22-23', 'PC 22-23'),
+    ('2023-24', 'COST 23-24', 'PC 23-24'),
+]
+SEASON_LABELS = [season for season, _, _ in SEASONS]
+SEASON_COST_COLUMNS = [cost_col for _, cost_col, _ in SEASONS]
+SEASON_PC_COLUMNS = [pc_col for _, _, pc_col in SEASONS]
+
+# Columns the pages read from each sheet
+SHEET_COLUMNS = {
+    'Agents': ['Agent Name', 'Agency Name', 'CT', 'Won%', 'Total Contract Value'],
+    'Just Agent Ranks': ['Agent Name', 'Agency Name', 'CT', 'Dollar Index', 'Index R', 'WinR', 'CTR', 'TCV R', 'TPV R'],
+    'PIBA': [
+        'Agent Name', 'Agency Name', 'Combined Names', 'Birth Date',
+        *[col for _, cost_col, pc_col in SEASONS for col in (cost_col, pc_col)],
+        'Dollars Captured Above/ Below Value', 'Total Cost', 'Total PC',
+    ],
+    'Agencies': ['Agency Name', 'CT', 'Dollar Index', 'Won%', 'Total Contract Value', 'Index R', 'WinR', 'CTR', 'TCV R', 'TPV R'],
+}
+
+# Narrower dtypes applied at ingest
+SHEET_DTYPES = {
+    'Agents': {'CT': 'Int32'},
+    'Just Agent Ranks': {'Index R': 'Int16', 'WinR': 'Int16', 'CTR': 'Int16', 'TCV R': 'Int16', 'TPV R': 'Int16'},
+    'Agencies': {'CT': 'Int16', 'Index R': 'Int16', 'WinR': 'Int16', 'CTR': 'Int16', 'TCV R': 'Int16', 'TPV R': 'Int16'},
+}
+
 # --------------------------------------------------------------------
 # Manual photo overrides (lower-case keys)
 # --------------------------------------------------------------------
@@ -124,102 +172,243 @@ manual_photo_overrides = {
     "reid duke": "https://a.espncdn.com/combiner/i?img=/i/headshots/nhl/players/full/3150433.png"
 }
 
+# --------------------------------------------------------------------
+# Player name corrections (lower-case keys)
+# --------------------------------------------------------------------
+player_name_corrections = {
+    "zotto del": "Michael Del Zotto",
+    "riemsdyk van": "James Van Riemsdyk",
+    "alexandre carrier a": "Alexandre Carrier",
+    "lias andersson l": "Lias Andersson",
+    "jesper boqvist j": "Jesper Boqvist",
+    "sompel vande": "Mitch Vande Sompel",
+    "colle dal": "Michael Dal Colle",
+    "alexander true": "Alexander True",
+    "giuseppe di": "Phil Di Giuseppe",
+}
+
 # --------------------------------------------------------------------
 # 1) Data-Loading & Caching Functions
 # --------------------------------------------------------------------
-@st.cache_data(ttl=0)
+@st.cache_resource
+def http_session():
+    # One pooled session with retries, shared across reruns and sessions
+    session = requests.Session()
+    session.headers.update({"User-Agent": "agent-dashboard"})
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+    session.mount("https://", HTTPAdapter(max_retries=retries))
+    return session
+
+def sheet_cache_path(sheet_name):
+    return os.path.join(DATA_CACHE_DIR, f"{sheet_name}.parquet")
+
+def convert_workbook(xlsx_bytes):
+    # Parse every sheet once and write the needed columns to Parquet
+    with pd.ExcelFile(BytesIO(xlsx_bytes), engine="calamine") as xls:
+        for sheet_name, columns in SHEET_COLUMNS.items():
+            wanted = set(columns)
+            sheet = xls.parse(sheet_name, usecols=lambda c: str(c).strip() in wanted)
+            sheet.columns = sheet.columns.str.strip()
+            # Fail here rather than with a KeyError on some page
+            missing = [col for col in columns if col not in sheet.columns]
+            if missing:
+                raise ValueError(f"The '{sheet_name}' sheet is missing columns: {', '.join(missing)}")
+            if sheet_name == 'PIBA':
+                # Blank cells come through as strings; whole-dollar columns shrink to int32
+                season_cols = SEASON_COST_COLUMNS + SEASON_PC_COLUMNS
+                sheet[season_cols] = sheet[season_cols].apply(pd.to_numeric, errors='coerce', downcast='integer')
+            try:
+                sheet = sheet[columns].astype(SHEET_DTYPES.get(sheet_name, {}))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"The '{sheet_name}' sheet has unexpected values: {e}") from e
+            tmp_path = sheet_cache_path(sheet_name) + ".part"
+            sheet.to_parquet(tmp_path, compression="zstd", index=False)
+            os.replace(tmp_path, sheet_cache_path(sheet_name))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_workbook():
+    # At most one conditional GET an hour; a 304 reuses the Parquet copies on disk
+    os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+    # Sidecar lines: ETag, Last-Modified, SHEET_FORMAT_VERSION
+    headers = {}
+    if os.path.exists(DATA_ETAG_PATH) and all(os.path.exists(sheet_cache_path(s)) for s in SHEET_COLUMNS):
+        with open(DATA_ETAG_PATH) as f:
+            lines = f.read().split("\n")
+        # Parquet in an older format is rebuilt with an unconditional GET
+        if len(lines) == 3 and lines[2] == SHEET_FORMAT_VERSION:
+            headers = {"If-None-Match": lines[0].strip(), "If-Modified-Since": lines[1].strip()}
+            headers = {name: value for name, value in headers.items() if value}
+    response = http_session().get(DATA_URL, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304:
+        return headers.get("If-None-Match") or headers["If-Modified-Since"]
+    response.raise_for_status()
+    etag = response.headers.get("ETag", "")
+    last_modified = response.headers.get("Last-Modified", "")
+    convert_workbook(response.content)
+    with open(DATA_ETAG_PATH, "w") as f:
+        f.write(f"{etag}\n{last_modified}\n{SHEET_FORMAT_VERSION}")
+    # Fall back to a content hash so the version always changes with the data
+    return etag or last_modified or hashlib.sha256(response.content).hexdigest()
+
+def load_sheet(sheet_name):
+    return pd.read_parquet(sheet_cache_path(sheet_name), columns=SHEET_COLUMNS[sheet_name])
+
 def load_data():
-    url_agents = "https://raw.githubusercontent.com/ethanhetu/agent-dashboard/main/AP%20Final.xlsx"
-    response = requests.get(url_agents)
-    if response.status_code != 200:
+    # Single entry point for the pages' data
+    try:
+        etag = fetch_workbook()
+    except requests.RequestException:
         st.error("Error fetching data. Please check the file URL and permissions.")
-        return None, None, None
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-        tmp.write(response.content)
-        tmp_path = tmp.name
-    xls = pd.ExcelFile(tmp_path)
-    agents_data = xls.parse('Agents')
-    agents_data.columns = agents_data.columns.str.strip()
-    
-    ranks_data = xls.parse('Just Agent Ranks')
-    ranks_data.columns = ranks_data.columns.str.strip()
-    
-    piba_data = xls.parse('PIBA')
-    piba_data.columns = piba_data.columns.str.strip()
-    return agents_data, ranks_data, piba_data
+        return None, None, None, None
+    except (ValueError, TypeError) as e:
+        st.error(f"Error reading the workbook. {e}")
+        return None, None, None, None
+    return load_workbook_sheets(etag, datetime.today().date())
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_workbook_sheets(etag, today):
+    # Shared read-only frames, indexed by name; today keys the cache so ages roll over
+    agents_data = load_sheet('Agents').set_index('Agent Name', drop=False).rename_axis(None)
+    ranks_data = load_sheet('Just Agent Ranks').set_index('Agent Name', drop=False).rename_axis(None)
+    # PIBA repeats agent and agency names on every row, so store them as categories
+    piba_data = load_sheet('PIBA').astype({'Agent Name': 'category', 'Agency Name': 'category'})
+    piba_data = piba_data.set_index('Agent Name', drop=False).rename_axis(None)
+    # Each agent's clients in one block, biggest Total Cost first
+    piba_data = piba_data.sort_values(['Agent Name', 'Total Cost'], ascending=[True, False], kind='stable')
+    piba_data['Age'] = calculate_ages(piba_data['Birth Date'], today)
+    piba_data['Delivery HTML'] = delivery_html(piba_data['Dollars Captured Above/ Below Value'])
+    piba_data['Total Cost Text'] = piba_data['Total Cost'].map('${:,.0f}'.format)
+    piba_data['Total PC Text'] = piba_data['Total PC'].map('${:,.0f}'.format)
+    piba_data['VCP HTML'] = vcp_html(piba_data['Total Cost'] / piba_data['Total PC'] * 100)
+    # Sort key for the All Clients sections
+    piba_data['Last Name'] = piba_data['Combined Names'].str.rsplit(n=1).str[-1]
+    # Version tag for cached helpers that take the frames unhashed
+    agencies_data = load_sheet('Agencies').set_index('Agency Name', drop=False).rename_axis(None)
+    for frame in (agents_data, ranks_data, piba_data, agencies_data):
+        frame.attrs['version'] = etag
+    return agents_data, ranks_data, piba_data, agencies_data
+
+def extract_zip(archive, dest_dir):
+    # Members are written from a thread pool; folders go first since makedirs races between threads
+    with zipfile.ZipFile(archive, 'r') as zip_ref:
+        members = [m for m in zip_ref.infolist() if not m.is_dir()]
+        for folder in {os.path.dirname(m.filename) for m in members}:
+            os.makedirs(os.path.join(dest_dir, folder), exist_ok=True)
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+            list(pool.map(lambda member: zip_ref.extract(member, dest_dir), members))
+
+def sync_release_zip(zip_url, dest_dir):
+    # Download and unpack a release archive; True when new files were written (.done holds its ETag)
+    zip_name = zip_url.rsplit("/", 1)[-1]
+    done_path = os.path.join(dest_dir, ".done")
+    if os.path.exists(done_path):
+        with open(done_path) as f:
+            extracted_etag = f.read().strip()
+        try:
+            head = http_session().head(zip_url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+        except requests.RequestException:
+            return False
+        remote_etag = head.headers.get("ETag", "")
+        if not remote_etag or remote_etag == extracted_etag:
+            return False
+    # Unpacked beside dest_dir and swapped in whole, so removed files don't linger
+    staging_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(dest_dir)}.", dir=os.path.dirname(os.path.abspath(dest_dir)))
+    try:
+        with http_session().get(zip_url, stream=True, timeout=HTTP_TIMEOUT) as response:
+            if response.status_code != 200:
+                return False
+            # A zip can't be unpacked mid-stream; up to 64 MB stays in memory
+            with tempfile.SpooledTemporaryFile(max_size=64 << 20) as archive:
+                # iter_content turns a stalled or dropped transfer into a requests exception
+                for chunk in response.iter_content(1 << 20):
+                    archive.write(chunk)
+                extract_zip(archive, staging_dir)
+            with open(os.path.join(staging_dir, ".done"), "w") as f:
+                f.write(response.headers.get("ETag", ""))
+        if os.path.isdir(dest_dir):
+            old_dir = staging_dir + ".old"
+            os.replace(dest_dir, old_dir)
+            os.replace(staging_dir, dest_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.replace(staging_dir, dest_dir)
+        return True
+    except (requests.RequestException, OSError):
+        return False
+    except zipfile.BadZipFile:
+        st.error(f"❌ {zip_name} is not a valid ZIP archive.")
+        return False
+    finally:
+        # Gone already after a successful swap
+        shutil.rmtree(staging_dir, ignore_errors=True)
 
-@st.cache_data(ttl=0)
+# The extractors hand back their folder and check for a new release at most hourly
+@st.cache_resource(ttl=3600, show_spinner=False)
 def extract_headshots():
-    global HEADSHOTS_DIR
     zip_url = "https://github.com/ethanhetu/agent-dashboard/releases/download/v1.0-headshots-full/NHL.Headshots.zip"
-    if not os.path.exists(HEADSHOTS_DIR):
-        os.makedirs(HEADSHOTS_DIR, exist_ok=True)
-        zip_path = os.path.join(HEADSHOTS_DIR, "NHL.Headshots.zip")
-        response = requests.get(zip_url, stream=True)
-        if response.status_code == 200:
-            with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            try:
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(HEADSHOTS_DIR)
-            except zipfile.BadZipFile:
-                st.error("❌ NHL.Headshots.zip is not a valid ZIP archive.")
+    if sync_release_zip(zip_url, HEADSHOTS_DIR):
+        headshot_index.clear()
+        resolve_headshots.clear()
+        get_headshot_path.cache_clear()
+        player_cards_html.clear()
+    return HEADSHOTS_DIR
 
-@st.cache_data(ttl=0)
+@st.cache_resource(ttl=3600, show_spinner=False)
 def extract_agent_photos():
-    global AGENT_PHOTOS_DIR
     zip_url = "https://github.com/ethanhetu/agent-dashboard/releases/download/v1.0-agent-photos/PNGs.zip"
-    if not os.path.exists(AGENT_PHOTOS_DIR):
-        os.makedirs(AGENT_PHOTOS_DIR, exist_ok=True)
-        zip_path = os.path.join(AGENT_PHOTOS_DIR, "PNGs.zip")
-        response = requests.get(zip_url, stream=True)
-        if response.status_code == 200:
-            with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            try:
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(AGENT_PHOTOS_DIR)
-            except zipfile.BadZipFile:
-                st.error("❌ PNGs.zip is not a valid ZIP archive.")
-
-@st.cache_data(ttl=0)
-def load_agencies_data():
-    url = "https://raw.githubusercontent.com/ethanhetu/agent-dashboard/main/AP%20Final.xlsx"
-    response = requests.get(url)
-    if response.status_code != 200:
-        st.error("Error fetching Agencies data. Please check the file URL and permissions.")
-        return None
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-        tmp.write(response.content)
-        tmp_path = tmp.name
-    xls = pd.ExcelFile(tmp_path)
-    agencies_data = xls.parse('Agencies')
-    agencies_data.columns = agencies_data.columns.str.strip()
-    return agencies_data
+    sync_release_zip(zip_url, AGENT_PHOTOS_DIR)
+    return AGENT_PHOTOS_DIR
 
 # --------------------------------------------------------------------
 # 2) Helper Functions
 # --------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def agent_name_options(_ranks_data, version):
+    # Selectbox options sorted by last name, built once per workbook version
+    names = _ranks_data['Agent Name'].dropna()
+    names = names[~names.isin(['', '(blank)', 'Grand Total'])]
+    last_names = names.str.rsplit(n=1).str[-1]
+    return tuple(names.iloc[last_names.argsort(kind='stable')].tolist())
+
+@st.cache_data(show_spinner=False)
+def agency_name_options(_agencies_data, version):
+    # Agency selectbox options in alphabetical order, built once per workbook version
+    return tuple(sorted(_agencies_data['Agency Name'].dropna().unique()))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def piba_by_agency(_piba_data, version):
+    # PIBA rows per agency, split once per workbook version
+    return {name: rows for name, rows in _piba_data.groupby('Agency Name', sort=False, observed=True)}
+
 def correct_player_name(name):
-    corrections = {
-        "zotto del": "Michael Del Zotto",
-        "riemsdyk van": "James Van Riemsdyk",
-        "alexandre carrier a": "Alexandre Carrier",
-        "lias andersson l": "Lias Andersson",
-        "jesper boqvist j": "Jesper Boqvist",
-        "sompel vande": "Mitch Vande Sompel",
-        "colle dal": "Michael Dal Colle",
-        "alexander true": "Alexander True",
-        "giuseppe di": "Phil Di Giuseppe",
-    }
     lower_name = name.lower().strip()
-    return corrections.get(lower_name, name)
+    return player_name_corrections.get(lower_name, name)
+
+@st.cache_resource
+def headshot_index(headshots_dir):
+    # Maps each "_"-delimited file-name prefix to a path; primary photos win over _away ones
+    png_files = [f for f in os.listdir(headshots_dir) if f.lower().endswith(".png")]
+    primary_files = [f for f in png_files if "_away" not in f.lower()]
+    away_files = [f for f in png_files if "_away" in f.lower()]
+    prefix_index = {}
+    names_dict = {}
+    for f in primary_files + away_files:
+        path = os.path.join(headshots_dir, f)
+        lower = f.lower()
+        pos = lower.find("_")
+        while pos != -1:
+            prefix_index.setdefault(lower[:pos], path)
+            pos = lower.find("_", pos + 1)
+    for f in primary_files:
+        parts = f.lower().replace(".png", "").split("_")
+        if len(parts) >= 2:
+            extracted_name = "_".join(parts[:2])
+            names_dict[extracted_name] = os.path.join(headshots_dir, f)
+    return prefix_index, names_dict
 
-def get_headshot_path(player_name):
+# Memoized per player across every roster
+@lru_cache(maxsize=4096)
+def get_headshot_path(player_name, headshots_dir=HEADSHOTS_DIR):
     # Check if we have a manual override first
     name_lower = player_name.lower().strip()
     if name_lower in manual_photo_overrides:
@@ -228,27 +417,32 @@ def get_headshot_path(player_name):
     # Otherwise, continue with existing local-file logic
     player_name = correct_player_name(player_name)
     formatted_name = player_name.lower().replace(" ", "_")
-    if HEADSHOTS_DIR and os.path.exists(HEADSHOTS_DIR):
+    if headshots_dir:
+        # A missing folder raises in headshot_index and lands in the except
         try:
-            possible_files = [f for f in os.listdir(HEADSHOTS_DIR) if f.lower().endswith(".png") and "_away" not in f.lower()]
-            for file in possible_files:
-                if file.lower().startswith(formatted_name + "_"):
-                    return os.path.join(HEADSHOTS_DIR, file)
-            names_dict = {}
-            for f in possible_files:
-                base = f.lower().replace(".png", "")
-                parts = base.split("_")
-                if len(parts) >= 2:
-                    extracted_name = "_".join(parts[:2])
-                    names_dict[extracted_name] = f
-            close_matches = difflib.get_close_matches(formatted_name, list(names_dict.keys()), n=1, cutoff=0.75)
+            prefix_index, names_dict = headshot_index(headshots_dir)
+            if formatted_name in prefix_index:
+                return prefix_index[formatted_name]
+            # rapidfuzz's ratio bounds difflib's, so it prefilters and difflib still picks the match
+            candidates = process.extract(formatted_name, names_dict.keys(), scorer=fuzz.ratio, score_cutoff=74.9, limit=None)
+            close_matches = difflib.get_close_matches(formatted_name, [c[0] for c in candidates], n=1, cutoff=0.75)
             if close_matches:
-                best_match = close_matches[0]
-                return os.path.join(HEADSHOTS_DIR, names_dict[best_match])
+                return names_dict[close_matches[0]]
         except Exception:
             pass
     return None
 
+@st.cache_data(show_spinner=False)
+def resolve_headshots(player_names, headshots_dir):
+    # Resolve each client's photo once per roster
+    return {name: get_headshot_path(name, headshots_dir) for name in player_names}
+
+def with_headshots(player_df):
+    # Also makes sure the headshots are extracted
+    headshots_dir = extract_headshots()
+    headshots = resolve_headshots(tuple(player_df['Combined Names'].unique()), headshots_dir)
+    return player_df.assign(Headshot=player_df['Combined Names'].map(headshots).fillna(""))
+
 def get_agent_photo_path(agent_name):
     formatted_name = agent_name.lower().replace(" ", "_")
     target_prefix = formatted_name + "_converted"
@@ -259,21 +453,38 @@ def get_agent_photo_path(agent_name):
                     return os.path.join(root, file)
     return None
 
+@st.cache_resource(show_spinner=False)
+def placeholder_src():
+    # Bundled placeholder, inlined once per process
+    with open(PLACEHOLDER_IMAGE_PATH, "rb") as f:
+        return f"data:image/svg+xml;base64,{base64.b64encode(f.read()).decode('utf-8')}"
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def headshot_data_uri(path, mtime):
+    # Card-sized WebP thumbnail as a data URI
+    try:
+        with Image.open(path) as image:
+            image.thumbnail((200, 200))
+            buffer = BytesIO()
+            image.save(buffer, format="WEBP", quality=82)
+        return f"data:image/webp;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+    except OSError:
+        with open(path, "rb") as f:
+            return f"data:image/png;base64,{base64.b64encode(f.read()).decode()}"
+
 def image_to_data_uri(image_path):
     try:
         with open(image_path, "rb") as img_file:
             b64_string = base64.b64encode(img_file.read()).decode('utf-8')
         return f"data:image/png;base64,{b64_string}"
     except Exception:
-        return PLACEHOLDER_IMAGE_URL
+        return placeholder_src()
 
-def calculate_age(birthdate):
-    try:
-        birth_date = pd.to_datetime(birthdate)
-        today = datetime.today()
-        return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-    except:
-        return "N/A"
+def calculate_ages(birth_dates, today):
+    # Vectorised age calculation; unparseable dates become <NA>
+    birth_dates = pd.to_datetime(birth_dates, errors='coerce')
+    before_birthday = (birth_dates.dt.month > today.month) | ((birth_dates.dt.month == today.month) & (birth_dates.dt.day > today.day))
+    return (today.year - birth_dates.dt.year - before_birthday.astype(int)).astype('Int16')
 
 def format_delivery_value(value):
     if value > 0:
@@ -281,6 +492,17 @@ def format_delivery_value(value):
     else:
         return f"<span style='color:#8B0000;'>${value:,.0f}</span>"
 
+def delivery_html(values):
+    # Column-wide version of format_delivery_value
+    colors = pd.Series(np.where(values > 0, "#006400", "#8B0000"), index=values.index)
+    return "<span style='color:" + colors + ";'>$" + values.map('{:,.0f}'.format) + "</span>"
+
+def vcp_html(vcp_values):
+    # The card's "Percent of Value Captured" line, built column-wide
+    colors = pd.Series(np.where(vcp_values >= 100, "#006400", "#8B0000"), index=vcp_values.index)
+    return ("\n<p style='font-weight:bold; text-align:center;'>Percent of Value Captured: <span style='color:"
+            + colors + ";'>" + vcp_values.map('{:.0f}'.format) + "%</span></p>")
+
 def format_value_capture_percentage(value):
     try:
         if value is not None and value < 2:
@@ -291,59 +513,31 @@ def format_value_capture_percentage(value):
     return f"<p style='font-weight:bold; text-align:center;'>Value Capture Percentage: <span style='color:{color};'>{value:.0f}%</span></p>"
 
 def compute_vcp_for_agent(agent_players):
-    seasons = [
-        ('2018-19', 'COST 18-19', 'PC 18-19'),
-        ('2019-20', 'COST 19-20', 'PC 19-20'),
-        ('2020-21', 'COST 20-21', 'PC 20-21'),
-        ('2021-22', 'COST 21-22', 'PC 21-22'),
-        ('2022-23', 'COST 22-23', 'PC 22-23'),
-        ('2023-24', 'COST 23-24', 'PC 23-24')
-    ]
-    results = {}
-    df = agent_players.copy(deep=True)
-    for season, cost_col, pc_col in seasons:
-        try:
-            total_cost = pd.to_numeric(df[cost_col], errors='coerce').sum()
-            total_pc = pd.to_numeric(df[pc_col], errors='coerce').sum()
-            if total_pc != 0:
-                results[season] = round((total_cost / total_pc) * 100, 2)
-            else:
-                results[season] = None
-        except Exception:
-            results[season] = None
-    return results
+    # All twelve season columns summed in one reduction
+    totals = agent_players[SEASON_COST_COLUMNS + SEASON_PC_COLUMNS].sum().to_numpy(dtype=float)
+    costs, pcs = totals[:len(SEASONS)], totals[len(SEASONS):]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vcp = np.where(pcs != 0, np.round(costs / pcs * 100, 2), np.nan)
+    return dict(zip(SEASON_LABELS, vcp.tolist()))
 
 def compute_agent_vcp_by_season(piba_data):
-    seasons = [
-        ('2018-19', 'COST 18-19', 'PC 18-19'),
-        ('2019-20', 'COST 19-20', 'PC 19-20'),
-        ('2020-21', 'COST 20-21', 'PC 20-21'),
-        ('2021-22', 'COST 21-22', 'PC 21-22'),
-        ('2022-23', 'COST 22-23', 'PC 22-23'),
-        ('2023-24', 'COST 23-24', 'PC 23-24')
-    ]
+    # One groupby over every season column, then plain column arithmetic
+    grouped = piba_data.groupby('Agent Name', observed=True)
+    totals = grouped[SEASON_COST_COLUMNS + SEASON_PC_COLUMNS].sum()
+    totals = totals[grouped.size() > 2]
     results = {}
-    df = piba_data.copy(deep=True)
-    for season, cost_col, pc_col in seasons:
-        df[cost_col] = pd.to_numeric(df[cost_col], errors='coerce')
-        df[pc_col] = pd.to_numeric(df[pc_col], errors='coerce')
-        grouped = df.groupby('Agent Name').agg(
-            total_cost=(cost_col, 'sum'),
-            total_pc=(pc_col, 'sum'),
-            client_count=('Agent Name', 'count')
-        ).reset_index()
-        grouped = grouped[grouped['client_count'] > 2]
-        grouped['VCP'] = grouped.apply(
-            lambda row: round((row['total_cost'] / row['total_pc']) * 100)
-            if pd.notnull(row['total_pc']) and row['total_pc'] != 0 else None,
-            axis=1
-        )
-        results[season] = grouped[['Agent Name', 'VCP']]
+    for season, cost_col, pc_col in SEASONS:
+        total_pc = totals[pc_col].where(totals[pc_col] != 0)
+        vcp = (totals[cost_col] / total_pc * 100).round()
+        results[season] = pd.DataFrame({'Agent Name': totals.index, 'VCP': vcp.to_numpy()})
     return results
 
-def plot_vcp_line_graph(vcp_per_year):
-    seasons = ['2018-19', '2019-20', '2020-21', '2021-22', '2022-23', '2023-24']
-    vcp_values = [vcp_per_year.get(season, np.nan) for season in seasons]
+# Cached as a Figure, since st.plotly_chart would re-validate a dict
+@st.cache_resource(show_spinner=False, max_entries=256)
+def vcp_figure(vcp_values):
+    # plotly is only imported by the two pages that draw charts
+    import plotly.graph_objects as go
+    seasons = SEASON_LABELS
     avg_vcp_values = [85.56, 103.17, 115.85, 84.30, 91.87, 108.12]
     fig = go.Figure()
     fig.add_trace(go.Scatter(
@@ -368,67 +562,63 @@ def plot_vcp_line_graph(vcp_per_year):
         yaxis=dict(title='VCP (%)', range=[0, 200]),
         legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
-def display_player_section(title, player_df):
+def plot_vcp_line_graph(vcp_per_year):
+    vcp_values = tuple(vcp_per_year.get(season, np.nan) for season in SEASON_LABELS)
+    st.plotly_chart(vcp_figure(vcp_values), use_container_width=True)
+
+def player_card_html(player, eager=False):
+    # No blank lines in the markup, or markdown ends the HTML block early
+    img_path = player['Headshot']
+    if img_path:
+        if img_path.startswith("http"):
+            img_src = img_path
+        else:
+            img_src = headshot_data_uri(img_path, os.path.getmtime(img_path))
+    else:
+        img_src = placeholder_src()
+    # Loading hints only matter for remote photos
+    load_attrs = ""
+    if img_src.startswith("http"):
+        load_attrs = ' loading="eager" fetchpriority="high"' if eager else ' loading="lazy"'
+    display_name = correct_player_name(player['Combined Names'])
+    # Override the cost (and agent delivery) for Evgeny Svechnikov
+    if display_name == "Evgeny Svechnikov":
+        cost_value = 2300000
+        cost_text = f"${cost_value:,.0f}"
+        delivery = format_delivery_value(2300000)
+        vcp_line = vcp_html(pd.Series([cost_value / player['Total PC'] * 100])).iloc[0]
+    else:
+        cost_text = player['Total Cost Text']
+        delivery = player['Delivery HTML']
+        vcp_line = player['VCP HTML']
+    card_html = (
+        f'<div style="text-align:center;"><img src="{img_src}"{load_attrs} style="width:200px; height:200px; display:block; margin:auto;"/></div>\n'
+        f"<h4 style='text-align:center; color:black; font-weight:bold; font-size:24px;'>{display_name}</h4>\n"
+        f'<div style="border: 2px solid #ddd; padding: 10px; border-radius: 10px;">\n'
+        f"<p><strong>Age:</strong> {player['Age'] if pd.notna(player['Age']) else 'N/A'}</p>\n"
+        f"<p><strong>Six-Year Agent Delivery:</strong> {delivery}</p>\n"
+        f"<p><strong>Six-Year Player Cost:</strong> {cost_text}</p>\n"
+        f"<p><strong>Six-Year Player Value:</strong> {player['Total PC Text']}</p>\n"
+        f"</div>"
+        f"{vcp_line}"
+    )
+    return card_html
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def player_cards_html(player_df, eager=False):
+    # Cached per section, so revisiting an agent or agency reuses its cards
+    return [player_card_html(player, eager) for player in player_df.to_dict('records')]
+
+def display_player_section(title, player_df, eager=False):
+    # One three-column CSS grid per section, in a single st.markdown call
     st.subheader(title)
-    client_cols = st.columns(3)
-    for idx, (_, player) in enumerate(player_df.iterrows()):
-        with client_cols[idx % 3]:
-            img_path = get_headshot_path(player['Combined Names'])
-            if img_path:
-                if img_path.startswith("http"):
-                    st.markdown(
-                        f"""
-                        <div style="text-align:center;">
-                            <img src="{img_path}"
-                                 style="width:200px; height:200px; display:block; margin:auto;"/>
-                        </div>
-                        """, unsafe_allow_html=True
-                    )
-                else:
-                    st.markdown(
-                        f"""
-                        <div style="text-align:center;">
-                            <img src="data:image/png;base64,{base64.b64encode(open(img_path, "rb").read()).decode()}"
-                                 style="width:200px; height:200px; display:block; margin:auto;"/>
-                        </div>
-                        """, unsafe_allow_html=True
-                    )
-            else:
-                st.markdown(
-                    f"""
-                    <div style="text-align:center;">
-                        <img src="{PLACEHOLDER_IMAGE_URL}"
-                             style="width:200px; height:200px; display:block; margin:auto;"/>
-                    </div>
-                    """, unsafe_allow_html=True
-                )
-            display_name = correct_player_name(player['Combined Names'])
-            # Override the cost (and agent delivery) for Evgeny Svechnikov
-            if display_name == "Evgeny Svechnikov":
-                cost_value = 2300000
-                delivery_value = 2300000
-            else:
-                cost_value = player['Total Cost']
-                delivery_value = player['Dollars Captured Above/ Below Value']
-            st.markdown(f"<h4 style='text-align:center; color:black; font-weight:bold; font-size:24px;'>{display_name}</h4>", unsafe_allow_html=True)
-            try:
-                vcp_value = (cost_value / player['Total PC']) * 100
-            except Exception:
-                vcp_value = None
-            box_html = f"""
-            <div style="border: 2px solid #ddd; padding: 10px; border-radius: 10px;">
-                <p><strong>Age:</strong> {calculate_age(player['Birth Date'])}</p>
-                <p><strong>Six-Year Agent Delivery:</strong> {format_delivery_value(delivery_value)}</p>
-                <p><strong>Six-Year Player Cost:</strong> ${cost_value:,.0f}</p>
-                <p><strong>Six-Year Player Value:</strong> ${player['Total PC']:,.0f}</p>
-            </div>
-            """
-            st.markdown(box_html, unsafe_allow_html=True)
-            if vcp_value is not None:
-                color = "#006400" if vcp_value >= 100 else "#8B0000"
-                st.markdown(f"<p style='font-weight:bold; text-align:center;'>Percent of Value Captured: <span style='color:{color};'>{vcp_value:.0f}%</span></p>", unsafe_allow_html=True)
+    cards = "\n".join(f"<div>\n{card_html}\n</div>" for card_html in player_cards_html(player_df, eager))
+    st.markdown(
+        f'<div style="display:grid; grid-template-columns:repeat(3, minmax(0, 1fr)); gap:1rem;">\n{cards}\n</div>',
+        unsafe_allow_html=True,
+    )
 
 # --------------------------------------------------------------------
 # Arbitration Page
@@ -439,7 +629,7 @@ def arbitration_page():
     st.write("In the table below, agents are ranked based on the number of times they have filed for arbitration, relative to the number of clients they have. The agents who were less frequent in their use of arbitration, and were therefore more likely to come to an agreement on a contract, were ranked higher.")
     
     # Load data to get CT and Agency info
-    _, ranks_data, _ = load_data()
+    _, ranks_data, _, _ = load_data()
     # Build lookup dictionaries from ranks data:
     ct_map = dict(zip(ranks_data["Agent Name"].str.strip(), ranks_data["CT"]))
     agency_map = dict(zip(ranks_data["Agent Name"].str.strip(), ranks_data["Agency Name"].str.strip()))
@@ -576,16 +766,20 @@ def arbitration_page():
 # 3) Main Dashboard Pages
 # --------------------------------------------------------------------
 def agent_dashboard():
-    agents_data, ranks_data, piba_data = load_data()
-    extract_headshots()
+    agents_data, ranks_data, piba_data, _ = load_data()
     if agents_data is None or ranks_data is None or piba_data is None:
         st.stop()
     st.title("Agent Overview Dashboard")
-    agent_names = ranks_data['Agent Name'].dropna().replace(['', '(blank)', 'Grand Total'], pd.NA).dropna()
-    agent_names = sorted(agent_names, key=lambda name: name.split()[-1])
-    selected_agent = st.selectbox("Select an Agent:", agent_names)
-    agent_info = agents_data[agents_data['Agent Name'] == selected_agent].iloc[0]
-    rank_info = ranks_data[ranks_data['Agent Name'] == selected_agent].iloc[0]
+    agent_names = agent_name_options(ranks_data, ranks_data.attrs['version'])
+    # The selected agent lives in the URL (?agent=...)
+    if "selected_agent" not in st.session_state:
+        requested_agent = st.query_params.get("agent")
+        st.session_state.selected_agent = requested_agent if requested_agent in agent_names else agent_names[0]
+    selected_agent = st.selectbox("Select an Agent:", agent_names, key="selected_agent")
+    if st.query_params.get("agent") != selected_agent:
+        st.query_params["agent"] = selected_agent
+    agent_info = agents_data.loc[selected_agent]
+    rank_info = ranks_data.loc[selected_agent]
     header_col1, header_col2 = st.columns([3, 1])
     with header_col1:
         st.header(f"{selected_agent} - {agent_info['Agency Name']}")
@@ -597,38 +791,36 @@ def agent_dashboard():
     col4.metric("Total Contract Value", f"${agent_info['Total Contract Value']:,.0f}")
     st.subheader("📈 Agent Rankings")
     col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Dollar Index Rank", f"#{int(rank_info['Index R'])}/90")
-    col2.metric("Win Percentage Rank", f"#{int(rank_info['WinR'])}/90")
-    col3.metric("Contracts Tracked Rank", f"#{int(rank_info['CTR'])}/90")
-    col4.metric("Total Contract Value Rank", f"#{int(rank_info['TCV R'])}/90")
-    col5.metric("Total Player Value Rank", f"#{int(rank_info['TPV R'])}/90")
-    agent_players = piba_data[piba_data['Agent Name'] == selected_agent]
+    col1.metric("Dollar Index Rank", f"#{rank_info['Index R']}/90")
+    col2.metric("Win Percentage Rank", f"#{rank_info['WinR']}/90")
+    col3.metric("Contracts Tracked Rank", f"#{rank_info['CTR']}/90")
+    col4.metric("Total Contract Value Rank", f"#{rank_info['TCV R']}/90")
+    col5.metric("Total Player Value Rank", f"#{rank_info['TPV R']}/90")
+    agent_players = with_headshots(piba_data.loc[[selected_agent]])
     vcp_for_agent = compute_vcp_for_agent(agent_players)
     plot_vcp_line_graph(vcp_for_agent)
     st.subheader("🏆 Biggest Clients")
-    top_clients = agent_players.sort_values(by='Total Cost', ascending=False).head(3)
-    display_player_section("Top 3 Clients by Total Cost", top_clients)
-    top_delivery_clients = agent_players.sort_values(by='Dollars Captured Above/ Below Value', ascending=False).head(3)
+    top_clients = agent_players.head(3)
+    display_player_section("Top 3 Clients by Total Cost", top_clients, eager=True)
+    # Top and bottom 3 without full sorts
+    top_delivery_clients = agent_players.nlargest(3, 'Dollars Captured Above/ Below Value')
     display_player_section("🏅 Agent 'Wins' (Top 3 by Six-Year Agent Delivery)", top_delivery_clients)
-    bottom_delivery_clients = agent_players.sort_values(by='Dollars Captured Above/ Below Value', ascending=True).head(3)
+    bottom_delivery_clients = agent_players.nsmallest(3, 'Dollars Captured Above/ Below Value')
     display_player_section("❌ Agent 'Losses' (Bottom 3 by Six-Year Agent Delivery)", bottom_delivery_clients)
     st.markdown("""<hr style="border: 2px solid #ccc; margin: 40px 0;">""", unsafe_allow_html=True)
     st.subheader("📋 All Clients")
-    agent_players['Last Name'] = agent_players['Combined Names'].apply(lambda x: x.split()[-1])
-    all_clients_sorted = agent_players.sort_values(by='Last Name')
+    all_clients_sorted = agent_players.sort_values(by='Last Name', kind='stable')
     display_player_section("All Clients (Alphabetical by Last Name)", all_clients_sorted)
 
 def agency_dashboard():
-    agencies_data = load_agencies_data()
-    _, _, piba_data = load_data()
+    _, _, piba_data, agencies_data = load_data()
     if agencies_data is None or piba_data is None:
         st.error("Error loading data for Agency Dashboard.")
         st.stop()
     st.title("Agency Overview Dashboard")
-    agency_names = agencies_data['Agency Name'].dropna().unique()
-    agency_names = sorted(agency_names)
+    agency_names = agency_name_options(agencies_data, agencies_data.attrs['version'])
     selected_agency = st.selectbox("Select an Agency:", agency_names)
-    agency_info = agencies_data[agencies_data['Agency Name'] == selected_agency].iloc[0]
+    agency_info = agencies_data.loc[selected_agency]
     st.header(f"{selected_agency}")
     st.subheader("📊 Financial Breakdown")
     col1, col2, col3, col4 = st.columns(4)
@@ -643,28 +835,28 @@ def agency_dashboard():
     col3.metric("Contracts Tracked Rank", f"#{int(agency_info['CTR'])}/74")
     col4.metric("Total Contract Value Rank", f"#{int(agency_info['TCV R'])}/74")
     col5.metric("Total Player Value Rank", f"#{int(agency_info['TPV R'])}/74")
-    agency_players = piba_data[piba_data['Agency Name'] == selected_agency]
+    agency_players = with_headshots(piba_by_agency(piba_data, piba_data.attrs['version']).get(selected_agency, piba_data.iloc[:0]))
     vcp_for_agency = compute_vcp_for_agent(agency_players)
     plot_vcp_line_graph(vcp_for_agency)
     st.subheader("🏆 Biggest Clients")
-    top_clients = agency_players.sort_values(by='Total Cost', ascending=False).head(3)
-    display_player_section("Top 3 Clients by Total Cost", top_clients)
-    top_delivery_clients = agency_players.sort_values(by='Dollars Captured Above/ Below Value', ascending=False).head(3)
+    # Top and bottom 3 without full sorts
+    top_clients = agency_players.nlargest(3, 'Total Cost')
+    display_player_section("Top 3 Clients by Total Cost", top_clients, eager=True)
+    top_delivery_clients = agency_players.nlargest(3, 'Dollars Captured Above/ Below Value')
     display_player_section("🏅 Agency 'Wins' (Top 3 by Six-Year Agent Delivery)", top_delivery_clients)
-    bottom_delivery_clients = agency_players.sort_values(by='Dollars Captured Above/ Below Value', ascending=True).head(3)
+    bottom_delivery_clients = agency_players.nsmallest(3, 'Dollars Captured Above/ Below Value')
     display_player_section("❌ Agency 'Losses' (Bottom 3 by Six-Year Agent Delivery)", bottom_delivery_clients)
     st.markdown("""<hr style="border: 2px solid #ccc; margin: 40px 0;">""", unsafe_allow_html=True)
     st.subheader("📋 All Clients")
     if 'Combined Names' in agency_players.columns:
-        agency_players['Last Name'] = agency_players['Combined Names'].apply(lambda x: x.split()[-1])
-        all_clients_sorted = agency_players.sort_values(by='Last Name')
+        all_clients_sorted = agency_players.sort_values(by='Last Name', kind='stable')
         display_player_section("All Clients (Alphabetical by Last Name)", all_clients_sorted)
     else:
         st.write("No client names available for sorting.")
 
 def leaderboard_page():
     st.title("Agent Leaderboard")
-    agents_data, ranks_data, piba_data = load_data()
+    agents_data, ranks_data, piba_data, _ = load_data()
     if agents_data is None or ranks_data is None or piba_data is None:
         st.error("Error loading data for leaderboard.")
         st.stop()
@@ -682,11 +874,8 @@ def leaderboard_page():
         overall_table = overall_table[overall_table['CT'] >= 10]
     overall_table = overall_table.head(90)
     
-    for rank, (_, row) in enumerate(overall_table.iterrows(), start=1):
-        agent_name = row['Agent Name']
-        agency = row['Agency Name']
-        dollar_index = row['Dollar Index']
-        contracts = row['CT']
+    # Rows unpack straight into the table's four columns
+    for rank, (agent_name, agency, dollar_index, contracts) in enumerate(overall_table.itertuples(index=False, name=None), start=1):
         card_html = f"""
         <div style="display: flex; align-items: center; border: 1px solid #ccc; border-radius: 8px; padding: 8px; margin-bottom: 8px;">
             <div style="flex: 0 0 40px; text-align: center; font-size: 18px; font-weight: bold;">
@@ -713,8 +902,8 @@ def leaderboard_page():
     for season in sorted(agent_vcp_by_season.keys(), reverse=True):
         df = agent_vcp_by_season[season]
         st.markdown(f"### {season}")
-        winners = df.sort_values(by='VCP', ascending=False).head(5).reset_index(drop=True)
-        losers = df.sort_values(by='VCP', ascending=True).head(5).reset_index(drop=True)
+        winners = df.nlargest(5, 'VCP').reset_index(drop=True)
+        losers = df.nsmallest(5, 'VCP').reset_index(drop=True)
         col_head1, col_head2 = st.columns(2)
         with col_head1:
             st.markdown("#### Five Biggest 'Winners' of the Year")
@@ -755,7 +944,7 @@ def second_contracts_leaderboard_page():
     st.title("Second Contracts Leaderboard")
     st.subheader("Which agents are delivering the most surplus value to clients with second contracts?")
     st.write("The 'second contract' is often a high-leverage game of risk and reward. Teams, players, and their representatives often grapple with how to appropriately price future performance. Given the inherent uncertainty of that exercise, one side of the equation typically ends up disproportionately benefitting from the agreement. Below, agents are ranked based on their Dollar Index, but ONLY looking at long-term contracts signed for RFA players coming off of their entry-level deals.")
-    agents_data, ranks_data, piba_data = load_data()
+    agents_data, ranks_data, piba_data, _ = load_data()
     agency_map = dict(zip(ranks_data["Agent Name"].str.strip(), ranks_data["Agency Name"].str.strip()))
     second_contracts_data = [
         {"Agent Name": "Peter Wallen", "Dollar Index": 0.68, "Total Contract Value": 35600000},
@@ -810,6 +999,7 @@ def second_contracts_leaderboard_page():
 # 5) Visualizations and Project Definitions
 # --------------------------------------------------------------------
 def overall_visualizations():
+    import plotly.graph_objects as go
     st.title("Classifications")
     # ----- Agent Tendency Classifications (STATIC) -----
     st.subheader("Looking at player performance and cost between 2018-19 and 2023-24, how can agent behavior be classified?")
@@ -944,7 +1134,7 @@ def overall_visualizations():
             st.markdown(f"<div style='border: 1px solid #8B0000; padding: 8px; margin: 4px; border-radius: 5px; text-align:center;'>{name}</div>", unsafe_allow_html=True)
     # ----- End Agency Tendency Classifications Section -----
     # ----- SCATTER PLOT with Yellow Trend Line -----
-    _, ranks_data, _ = load_data()
+    _, ranks_data, _, _ = load_data()
     fig = go.Figure(data=go.Scatter(
         x=ranks_data['CT'],
         y=ranks_data['Dollar Index'],
@@ -1001,33 +1191,44 @@ def project_definitions():
 # --------------------------------------------------------------------
 # 5) Navigation
 # --------------------------------------------------------------------
-st.sidebar.title("Sitemap")
-page = st.sidebar.radio("Go to", [
-    "Home",
-    "Agent Dashboard",
-    "Agency Dashboard",
-    "Leaderboard",
-    "Second Contracts Leaderboard",
-    "Classifications",
-    "Arbitration",
-    "Project Definitions",
-])
+def main():
+    st.sidebar.title("Sitemap")
+    page = st.sidebar.radio("Go to", [
+        "Home",
+        "Agent Dashboard",
+        "Agency Dashboard",
+        "Leaderboard",
+        "Second Contracts Leaderboard",
+        "Classifications",
+        "Arbitration",
+        "Project Definitions",
+    ])
+    # Revalidate the workbook against GitHub now
+    if st.sidebar.button("Reload data", help="Check GitHub for a newer workbook now instead of waiting for the hourly check."):
+        fetch_workbook.clear()
+        load_workbook_sheets.clear()
+        agent_name_options.clear()
+        agency_name_options.clear()
+        piba_by_agency.clear()
+
+    if page == "Home":
+        st.title("Landing Page - Agent Insights Project")
+        st.subheader("Please use the sidebar to navigate to your desired page.")
+        st.write("Project created by Ethan Hetu, 2024-25 Nashville Predators Hockey Operations Intern. NOTE: If this is your first time viewing this dashboard, please first read the 'Project Definitions' as there are explanations of potentially unfamiliar terms that are central to the project.")
+    elif page == "Agent Dashboard":
+        agent_dashboard()
+    elif page == "Agency Dashboard":
+        agency_dashboard()
+    elif page == "Leaderboard":
+        leaderboard_page()
+    elif page == "Second Contracts Leaderboard":
+        second_contracts_leaderboard_page()
+    elif page == "Classifications":
+        overall_visualizations()
+    elif page == "Arbitration":
+        arbitration_page()
+    elif page == "Project Definitions":
+        project_definitions()
 
-if page == "Home":
-    st.title("Landing Page - Agent Insights Project")
-    st.subheader("Please use the sidebar to navigate to your desired page.")
-    st.write("Project created by Ethan Hetu, 2024-25 Nashville Predators Hockey Operations Intern. NOTE: If this is your first time viewing this dashboard, please first read the 'Project Definitions' as there are explanations of potentially unfamiliar terms that are central to the project.")
-elif page == "Agent Dashboard":
-    agent_dashboard()
-elif page == "Agency Dashboard":
-    agency_dashboard()
-elif page == "Leaderboard":
-    leaderboard_page()
-elif page == "Second Contracts Leaderboard":
-    second_contracts_leaderboard_page()
-elif page == "Classifications":
-    overall_visualizations()
-elif page == "Arbitration":
-    arbitration_page()
-elif page == "Project Definitions":
-    project_definitions()
+if __name__ == "__main__":
+    main()